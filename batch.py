@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+# Decode a saved deck without the GUI. Results are appended to a JSON
+# lines log as cards are decoded, with a checkpoint next to it, so an
+# interrupted run picks up from the last checkpointed card. A deck can
+# be split across machines by card index range and the shard logs merged
+# back in card order.
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication
+
+import argparse
+import hashlib
+import json
+import sys
+
+from card import Deck, word_from_data
+
+
+def checkpoint_path(log_path):
+    return log_path + ".checkpoint"
+
+
+def read_checkpoint(log_path):
+    try:
+        with open(checkpoint_path(log_path), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(log_path, checkpoint):
+    # Write aside and rename, so a crash leaves either the old or the new
+    # checkpoint in place, never a torn one
+    path = checkpoint_path(log_path)
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def deck_fingerprint(deck):
+    # Identifies the deck a log belongs to, so a resumed run or a merge
+    # cannot mix results of a different or re-saved deck
+    data = json.dumps(deck.to_json(), sort_keys=True).encode()
+    return {"sha256": hashlib.sha256(data).hexdigest(), "cards": len(deck.cards)}
+
+
+def run_batch(deck, log_path, start=0, stop=None, every=100):
+    if every < 1:
+        raise Exception(f"checkpoint interval must be at least 1, not {every}")
+
+    stop = len(deck.cards) if stop is None else min(stop, len(deck.cards))
+    if not 0 <= start <= stop:
+        raise Exception(f"invalid card range {start}-{stop}")
+
+    fingerprint = deck_fingerprint(deck)
+
+    checkpoint = read_checkpoint(log_path)
+    if checkpoint is None:
+        checkpoint = {
+            "deck": fingerprint,
+            "start": start,
+            "stop": stop,
+            "next": start,
+            "offset": 0,
+            "done": False,
+        }
+    elif checkpoint.get("deck") != fingerprint:
+        raise Exception(f"{log_path} was written for a different deck")
+    elif (checkpoint["start"], checkpoint["stop"]) != (start, stop):
+        raise Exception(
+            f"{log_path} holds cards {checkpoint['start']}-{checkpoint['stop']},"
+            f" not {start}-{stop}"
+        )
+
+    if checkpoint["done"]:
+        return checkpoint
+
+    log_size = os.path.getsize(log_path) if os.path.exists(log_path) else None
+    if checkpoint["offset"] and (log_size is None or log_size < checkpoint["offset"]):
+        raise Exception(
+            f"{log_path} is missing or shorter than its checkpoint,"
+            " remove the checkpoint to start over"
+        )
+
+    # Anything logged past the last checkpoint is decoded again
+    with open(log_path, "r+b" if log_size is not None else "wb") as f:
+        f.truncate(checkpoint["offset"])
+        f.seek(checkpoint["offset"])
+
+        remaining = Deck(cards=deck.cards[checkpoint["next"] : stop])
+        for index, card in enumerate(remaining.streamed(), checkpoint["next"]):
+            # A card that cannot be decoded, for example because its
+            # image is unreadable, must not stop every resumed run too
+            try:
+                data = card.decode_card()
+            except Exception as e:
+                record = {"index": index, "path": card.path, "error": str(e)}
+            else:
+                record = {
+                    "index": index,
+                    "path": card.path,
+                    "word": word_from_data(data.holes),
+                    "columns": list(data.columns),
+                    "worst_margin": data.worst_column[1],
+                }
+            f.write((json.dumps(record) + "\n").encode())
+
+            if (index + 1 - start) % every == 0:
+                f.flush()
+                os.fsync(f.fileno())
+                checkpoint["next"] = index + 1
+                checkpoint["offset"] = f.tell()
+                write_checkpoint(log_path, checkpoint)
+
+        f.flush()
+        os.fsync(f.fileno())
+        checkpoint["next"] = stop
+        checkpoint["offset"] = f.tell()
+        checkpoint["done"] = True
+        write_checkpoint(log_path, checkpoint)
+
+    return checkpoint
+
+
+def read_log(log_path):
+    with open(log_path, "r") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def merge_logs(log_paths, output_path, cards=None):
+    # The shards must all come from the same deck and cover it whole,
+    # each one starting where the previous one stopped. Logs are each in
+    # card order, so they are streamed one after the other.
+    checkpoints = []
+    fingerprint = None
+    for log_path in log_paths:
+        checkpoint = read_checkpoint(log_path)
+        if checkpoint is None or not checkpoint["done"]:
+            raise Exception(f"shard not finished: {log_path}")
+
+        if fingerprint is None:
+            fingerprint = checkpoint.get("deck")
+        if checkpoint.get("deck") is None or checkpoint["deck"] != fingerprint:
+            raise Exception(f"{log_path} was written for a different deck")
+
+        checkpoints.append((checkpoint["start"], checkpoint["stop"], log_path))
+
+    checkpoints.sort()
+    expected = 0
+    for start, stop, log_path in checkpoints:
+        if start > expected:
+            raise Exception(f"cards {expected}-{start} are in no shard")
+        if start < expected:
+            raise Exception(f"{log_path} overlaps cards {start}-{expected}")
+        expected = stop
+
+    if cards is not None and cards != fingerprint["cards"]:
+        raise Exception(f"the deck has {fingerprint['cards']} cards, not {cards}")
+    if expected != fingerprint["cards"]:
+        raise Exception(f"cards {expected}-{fingerprint['cards']} are in no shard")
+
+    with open(output_path, "w") as f:
+        for start, stop, log_path in checkpoints:
+            for record in read_log(log_path):
+                f.write(json.dumps(record) + "\n")
+
+
+def nonnegative_int(value):
+    value = int(value)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, not {value}")
+    return value
+
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode decks in batch")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="decode a deck, resuming if possible")
+    run.add_argument("deck", help="deck JSON saved from the GUI")
+    run.add_argument("log", help="JSON lines log of the decoded cards")
+    run.add_argument(
+        "--start", type=nonnegative_int, default=0, help="first card index"
+    )
+    run.add_argument("--stop", type=nonnegative_int, help="card index to stop before")
+    run.add_argument(
+        "--every", type=positive_int, default=100, help="cards between checkpoints"
+    )
+
+    merge = commands.add_parser("merge", help="merge shard logs in card order")
+    merge.add_argument("output")
+    merge.add_argument("logs", nargs="+")
+    merge.add_argument(
+        "--cards", type=nonnegative_int, help="number of cards in the deck"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        app = QGuiApplication(sys.argv[:1])
+        with open(args.deck, "r") as f:
+            deck = Deck.from_json(json.load(f))
+        run_batch(deck, args.log, start=args.start, stop=args.stop, every=args.every)
+
+    elif args.command == "merge":
+        merge_logs(args.logs, args.output, cards=args.cards)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+# Micro-benchmarks for the decode hot paths, run on synthetic cards so
+# the decoded data can be checked against what was punched.
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication
+
+from copy import deepcopy
+
+import argparse
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from card import (
+    IBM_MODEL_029_KEYPUNCH,
+    Card,
+    Deck,
+    ascii_card_from_data,
+    master_card_to_map,
+    test_format,
+    word_from_data,
+)
+from synthetic import random_text, render_card
+
+
+def max_rss():
+    # Peak resident set size of the process so far, which unlike
+    # tracemalloc includes image buffers allocated by Qt
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(name, fn, items=1, repeat=1, accuracy=None, trace=True):
+    # Time a few runs, then, if trace is set, run once more under
+    # tracemalloc for the peak Python heap usage. The growth of the peak
+    # RSS over the timed runs is recorded too.
+    rss_before = max_rss()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    rss_after = max_rss()
+
+    peak = None
+    if trace:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    row = {
+        "name": name,
+        "items": items,
+        "seconds": elapsed,
+        "items_per_second": items / elapsed if elapsed else None,
+        "peak_bytes": peak,
+        "max_rss_bytes": rss_after,
+        "max_rss_growth_bytes": rss_after - rss_before,
+    }
+    if accuracy is not None:
+        row["accuracy"] = accuracy(result)
+
+    heap = f"{peak / 1024:10.1f} KiB" if peak is not None else f"{'-':>14s}"
+    line = (
+        f"{name:36s} {elapsed * 1000:12.3f} ms"
+        f" {items / elapsed if elapsed else 0:14.1f}/s {heap}"
+        f"  rss {rss_after / 2**20:8.1f} MiB (+{(rss_after - rss_before) / 2**20:.1f})"
+    )
+    if "accuracy" in row:
+        line += f"  accuracy {row['accuracy']:.4f}"
+    print(line, flush=True)
+    return row
+
+
+def render_pool(directory, size, seed, **distortion):
+    # A few distinct scans the decks cycle through, with their text
+    rng = random.Random(seed)
+    pool = []
+    for i in range(size):
+        text = random_text(rng)
+        image, geometry = render_card(text, seed=rng.random(), **distortion)
+        path = os.path.join(directory, f"card{i:03d}.png")
+        image.save(path)
+        pool.append((path, geometry, text))
+    return pool
+
+
+def make_deck(pool, count):
+    cards = []
+    texts = []
+    for i in range(count):
+        path, geometry, text = pool[i % len(pool)]
+        cards.append(
+            Card(geometry=deepcopy(geometry), format=deepcopy(test_format), path=path)
+        )
+        texts.append(text)
+    return Deck(cards=cards), texts
+
+
+def character_accuracy(words, texts):
+    total = sum(len(text) for text in texts)
+    right = sum(a == b for word, text in zip(words, texts) for a, b in zip(word, text))
+    return right / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the card decoder")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 100000])
+    parser.add_argument("--pool", type=int, default=8, help="distinct card images")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=0.01)
+    parser.add_argument("--blur", type=int, default=1)
+    parser.add_argument("--skew", type=float, default=0.0)
+    parser.add_argument("--lighting", type=float, default=0.2)
+    parser.add_argument(
+        "--trace-limit",
+        type=int,
+        default=1000,
+        help="largest deck decoded again under tracemalloc",
+    )
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv[:1])
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        pool = render_pool(
+            directory,
+            args.pool,
+            args.seed,
+            dpi=args.dpi,
+            noise=args.noise,
+            blur=args.blur,
+            skew=args.skew,
+            lighting=args.lighting,
+        )
+
+        results.append(
+            measure(
+                "master_card_to_map",
+                lambda: master_card_to_map(IBM_MODEL_029_KEYPUNCH),
+                repeat=args.repeat,
+            )
+        )
+
+        deck, texts = make_deck(pool, 1)
+        card = deck.cards[0]
+        card.image
+
+        def parse_cold():
+            del card._gray_key
+            return card.parse_card()
+
+        card.parse_card()
+        results.append(measure("parse_card", parse_cold, repeat=args.repeat))
+
+        def parse_threshold():
+            card.format.threshold = 0.3 - card.format.threshold
+            return card.parse_card()
+
+        results.append(
+            measure("parse_card (threshold only)", parse_threshold, repeat=args.repeat)
+        )
+        card.format.threshold = test_format.threshold
+
+        data = card.parse_card()
+        results.append(
+            measure(
+                "word_from_data",
+                lambda: word_from_data(data),
+                repeat=args.repeat,
+                accuracy=lambda word: character_accuracy([word], texts),
+            )
+        )
+
+        word = word_from_data(data)
+        results.append(
+            measure(
+                "ascii_card_from_data",
+                lambda: ascii_card_from_data(data, card.format, word),
+                repeat=args.repeat,
+            )
+        )
+
+        for size in args.sizes:
+            deck, texts = make_deck(pool, size)
+            repeat = max(1, args.repeat // size)
+
+            results.append(
+                measure(
+                    f"Deck.to_json [{size}]", deck.to_json, items=size, repeat=repeat
+                )
+            )
+
+            deck_json = deck.to_json()
+            results.append(
+                measure(
+                    f"Deck.from_json [{size}]",
+                    lambda: Deck.from_json(deck_json),
+                    items=size,
+                    repeat=repeat,
+                )
+            )
+
+            results.append(
+                measure(
+                    f"deck decode [{size}]",
+                    lambda: [word for _, _, word in deck.decoded()],
+                    items=size,
+                    accuracy=lambda words: character_accuracy(words, texts),
+                    trace=size <= args.trace_limit,
+                )
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,14 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple, replace
 from copy import deepcopy
+from array import array
+from collections import deque
 
 import sys
 import json
+import math
 
 IBM_MODEL_029_KEYPUNCH = """
     /&-0123456789ABCDEFGHIJKLMNOPQR/STUVWXYZ:#@'="`.<(+|!$*);^~,%_>? |
@@ -43,6 +46,13 @@ def master_card_to_map(master_card_string):
 
 translate = master_card_to_map(IBM_MODEL_029_KEYPUNCH)
 
+# Cells closer than this to the threshold are worth a second look
+LOW_CONFIDENCE_MARGIN = 0.05
+
+# Margin byte of cells falling outside of the image, margins of the
+# other cells go from 0 to 254
+OUTSIDE_MARGIN = 255
+
 
 class ZoomableGraphicsView(QGraphicsView):
     def __init__(self, parent=None):
@@ -125,17 +135,70 @@ class CardFormat:
     threshold: float
 
 
+@dataclass
+class CardData:
+    # One word per column with a bit per row, the first row in the most
+    # significant bit, like column binary.
+    columns: array
+    # Distance of each cell gray level from the threshold scaled to
+    # 0-254, column major. Cells outside of the image are OUTSIDE_MARGIN.
+    margins: bytes
+    rows: int
+
+    def column_margins(self, x):
+        start = x * self.rows
+        return self.margins[start : start + self.rows]
+
+    @property
+    def holes(self):
+        return [
+            [bool(bits >> (self.rows - 1 - y) & 1) for y in range(self.rows)]
+            for bits in self.columns
+        ]
+
+    def margin(self, x, y):
+        margin = self.margins[x * self.rows + y]
+        return None if margin == OUTSIDE_MARGIN else margin / 254
+
+    def column_margin(self, x):
+        # Only cells inside of the image say how ambiguous a column is
+        inside = [m for m in self.column_margins(x) if m != OUTSIDE_MARGIN]
+        return min(inside, default=254) / 254
+
+    @property
+    def outside_columns(self):
+        return [
+            x
+            for x in range(len(self.columns))
+            if OUTSIDE_MARGIN in self.column_margins(x)
+        ]
+
+    @property
+    def worst_column(self):
+        if not self.columns:
+            return (None, 0.0)
+
+        x = min(range(len(self.columns)), key=self.column_margin)
+        return (x, self.column_margin(x))
+
+
 @dataclass
 class Card:
     geometry: CardGeometry
     format: CardFormat
     path: str
+    # Where the card was found on a scan holding several cards
+    region: CardGeometry | None = None
 
     @property
     def image_data(self):
         if hasattr(self, "_image_data"):
             return self._image_data
 
+        if hasattr(self, "_image_owner"):
+            self._image_data = self._image_owner.image_data
+            return self._image_data
+
         img = QImage(self.path)
         pxm = QPixmap(img)
 
@@ -145,6 +208,13 @@ class Card:
         self._image_data = (img, pxm)
         return self._image_data
 
+    def drop_caches(self):
+        # Forget the loaded image and sampled gray levels, they are
+        # rebuilt on demand
+        for attr in ("_image_data", "_gray_key", "_gray_data"):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
     @property
     def row_y(self):
         vertical_scale = self.geometry.height / self.format.reference_height
@@ -183,7 +253,21 @@ class Card:
     def image_pixmap(self):
         return self.image_data[1]
 
-    def parse_card(self):
+    @property
+    def sampling_key(self):
+        # Everything the sampled gray levels depend on: the threshold is
+        # left out, so changing it alone reuses the cached matrix.
+        return (
+            self.path,
+            astuple(self.geometry),
+            astuple(replace(self.format, threshold=None)),
+        )
+
+    def sample_card(self):
+        key = self.sampling_key
+        if getattr(self, "_gray_key", None) == key:
+            return self._gray_data
+
         data = []
         image_size = self.image.size()
 
@@ -203,24 +287,167 @@ class Card:
                     r, g, b, _ = QColor(color).getRgbF()
                     gray = (r + g + b) / 3
 
-                    isHole = gray < self.format.threshold
-                    column.append(isHole)
+                    column.append(gray)
 
                 else:
-                    column.append(False)
+                    # Outside of the image, never a hole
+                    column.append(None)
 
+        self._gray_key = key
+        self._gray_data = data
         return data
 
+    def parse_card(self):
+        threshold = self.format.threshold
+        return [
+            [gray is not None and gray < threshold for gray in column]
+            for column in self.sample_card()
+        ]
+
+    def decode_card(self):
+        threshold = self.format.threshold
+        columns = array("L")
+        margins = bytearray()
+
+        for column in self.sample_card():
+            bits = 0
+            for gray in column:
+                bits <<= 1
+
+                if gray is None:
+                    margins.append(OUTSIDE_MARGIN)
+                    continue
+
+                if gray < threshold:
+                    bits |= 1
+
+                margins.append(min(254, round(abs(gray - threshold) * 254)))
+
+            columns.append(bits)
+
+        return CardData(columns=columns, margins=bytes(margins), rows=self.format.rows)
+
+    def threshold_sweep(self):
+        # A cell becomes a hole as soon as the threshold goes above its
+        # gray level, so walking the sorted cell values gives every word
+        # the card can decode to, from a single sampling pass. Returns a
+        # list of (low, high, word) where word is decoded for any
+        # threshold in (low, high].
+        gray_data = self.sample_card()
+        cells = sorted(
+            (gray, x, y)
+            for x, column in enumerate(gray_data)
+            for y, gray in enumerate(column)
+            if gray is not None
+        )
+
+        keys = [[" "] * len(column) for column in gray_data]
+        chars = [translate.get(tuple(key), "•") for key in keys]
+
+        sweep = []
+        low = 0.0
+        word = "".join(chars)
+
+        i = 0
+        while i < len(cells):
+            gray = cells[i][0]
+            while i < len(cells) and cells[i][0] == gray:
+                _, x, y = cells[i]
+                keys[x][y] = "O"
+                chars[x] = translate.get(tuple(keys[x]), "•")
+                i += 1
+
+            new_word = "".join(chars)
+            if new_word != word:
+                # Cells at exactly 0.0 would leave an empty interval
+                if low < gray:
+                    sweep.append((low, gray, word))
+                low = gray
+                word = new_word
+
+        # As would cells at exactly 1.0
+        if low < 1.0:
+            sweep.append((low, 1.0, word))
+        return sweep
+
     def parse(self, format):
         data = self.parse_card()
         word = word_from_data(data)
         return (data, word, ascii_card_from_data(data, format, word))
 
 
+@dataclass
+class TriageEntry:
+    index: int
+    worst_column: int
+    worst_margin: float
+    unmapped_columns: list[int]
+    # Columns with cells off the image, usually a misplaced grid
+    outside_columns: list[int]
+
+    @property
+    def needs_review(self):
+        return (
+            bool(self.unmapped_columns)
+            or bool(self.outside_columns)
+            or self.worst_margin < LOW_CONFIDENCE_MARGIN
+        )
+
+    @property
+    def sort_key(self):
+        # Cards needing review first, least confident first among them
+        return (not self.needs_review, self.worst_margin)
+
+    @staticmethod
+    def from_decoded(index, data, word):
+        worst_column, worst_margin = data.worst_column
+        return TriageEntry(
+            index=index,
+            worst_column=worst_column,
+            worst_margin=worst_margin,
+            unmapped_columns=[x for x, c in enumerate(word) if c == "•"],
+            outside_columns=data.outside_columns,
+        )
+
+
 @dataclass
 class Deck:
     cards: list[Card]
 
+    def streamed(self):
+        # Yield the cards one at a time, dropping their caches as soon as
+        # no following card shares the scan, so memory stays flat however
+        # large the deck is.
+        pending = []
+        for card in self.cards:
+            if pending and pending[-1].path != card.path:
+                for done in pending:
+                    done.drop_caches()
+                pending = []
+
+            yield card
+            pending.append(card)
+
+        for done in pending:
+            done.drop_caches()
+
+    def decoded(self):
+        # Yield (card, data, word) one card at a time
+        for card in self.streamed():
+            data = card.decode_card()
+            yield card, data, word_from_data(data.holes)
+
+    def triage(self):
+        # Cards needing review first, so reviewers can stop at the first
+        # entry that does not. Goes through decoded() so scans are not
+        # kept in memory.
+        entries = [
+            TriageEntry.from_decoded(index, data, word)
+            for index, (card, data, word) in enumerate(self.decoded())
+        ]
+        entries.sort(key=lambda entry: entry.sort_key)
+        return entries
+
     def to_json(self):
         return {
             "cards": [
@@ -232,6 +459,16 @@ class Deck:
                         "bottom": card.geometry.bottom,
                         "left": card.geometry.left,
                     },
+                    "region": (
+                        {
+                            "top": card.region.top,
+                            "right": card.region.right,
+                            "bottom": card.region.bottom,
+                            "left": card.region.left,
+                        }
+                        if card.region is not None
+                        else None
+                    ),
                     "format": {
                         "columns": card.format.columns,
                         "rows": card.format.rows,
@@ -271,9 +508,24 @@ class Deck:
                 threshold=card_data["format"]["threshold"],
             )
 
-            card = Card(geometry=geometry, format=format, path=card_data["path"])
+            region = None
+            if card_data.get("region") is not None:
+                region = CardGeometry(
+                    top=card_data["region"]["top"],
+                    right=card_data["region"]["right"],
+                    bottom=card_data["region"]["bottom"],
+                    left=card_data["region"]["left"],
+                )
+
+            card = Card(
+                geometry=geometry,
+                format=format,
+                path=card_data["path"],
+                region=region,
+            )
             cards.append(card)
 
+        share_images(cards)
         return Deck(cards=cards)
 
     @staticmethod
@@ -288,6 +540,199 @@ class Deck:
         ]
         return Deck(cards=cards)
 
+    @staticmethod
+    def from_sheets(paths):
+        cards = []
+        for path in paths:
+            img = QImage(path)
+            if img.isNull():
+                raise Exception(f"cannot open image file at path: {path}")
+
+            # Blobs not shaped like a card, such as cards touching each
+            # other or lying portrait, are kept unaligned rather than lost
+            sheet_cards = [
+                Card(
+                    path=path,
+                    geometry=(
+                        deepcopy(region)
+                        if card_shaped
+                        else CardGeometry(top=0, right=0, bottom=0, left=0)
+                    ),
+                    format=deepcopy(test_format),
+                    region=region,
+                )
+                for region, card_shaped in detect_card_regions(img)
+            ]
+
+            if not sheet_cards:
+                sheet_cards = [
+                    Card(
+                        path=path,
+                        geometry=CardGeometry(top=0, right=0, bottom=0, left=0),
+                        format=deepcopy(test_format),
+                    )
+                ]
+
+            # Every card on the sheet uses the image loaded for detection
+            sheet_cards[0]._image_data = (img, QPixmap(img))
+            share_images(sheet_cards)
+            cards.extend(sheet_cards)
+
+        return Deck(cards=cards)
+
+
+def share_images(cards):
+    # Cards cut from the same scan load and decode the image only once
+    owners = {}
+    for card in cards:
+        owner = owners.setdefault(card.path, card)
+        if owner is not card:
+            card._image_owner = owner
+
+
+def detect_card_regions(
+    image, size=256, contrast=0.15, min_area=0.01, min_aspect=1.5, max_aspect=3.5
+):
+    # Look for card shaped blobs standing out from the sheet background
+    # on a downscaled copy of the image, then scale the bounding boxes
+    # back. Cards are expected to lie roughly horizontal. Returns
+    # (region, card_shaped) for every blob, in reading order.
+    small = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    width, height = small.width(), small.height()
+    if width == 0 or height == 0:
+        return []
+
+    def gray(x, y):
+        r, g, b, _ = QColor(small.pixel(x, y)).getRgbF()
+        return (r + g + b) / 3
+
+    levels = [[gray(x, y) for x in range(width)] for y in range(height)]
+
+    border = sorted(
+        [levels[0][x] for x in range(width)]
+        + [levels[height - 1][x] for x in range(width)]
+        + [levels[y][0] for y in range(height)]
+        + [levels[y][width - 1] for y in range(height)]
+    )
+    background = border[len(border) // 2]
+
+    mask = [[abs(v - background) > contrast for v in row] for row in levels]
+
+    boxes = []
+    for y0 in range(height):
+        for x0 in range(width):
+            if not mask[y0][x0]:
+                continue
+
+            mask[y0][x0] = False
+            queue = deque([(x0, y0)])
+            left, top, right, bottom = x0, y0, x0, y0
+
+            while queue:
+                x, y = queue.popleft()
+                left, right = min(left, x), max(right, x)
+                top, bottom = min(top, y), max(bottom, y)
+
+                for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if 0 <= nx < width and 0 <= ny < height and mask[ny][nx]:
+                        mask[ny][nx] = False
+                        queue.append((nx, ny))
+
+            box_width = right - left + 1
+            box_height = bottom - top + 1
+            if box_width * box_height < min_area * width * height:
+                continue
+
+            card_shaped = min_aspect <= box_width / box_height <= max_aspect
+            boxes.append((left, top, right + 1, bottom + 1, card_shaped))
+
+    # Reading order: rows of cards top to bottom, each row left to right
+    boxes.sort(key=lambda box: box[1])
+    rows = []
+    for box in boxes:
+        if rows and box[1] < rows[-1][0][1] + (rows[-1][0][3] - rows[-1][0][1]) / 2:
+            rows[-1].append(box)
+        else:
+            rows.append([box])
+
+    scale_x = image.width() / width
+    scale_y = image.height() / height
+    band = math.ceil(max(scale_x, scale_y)) + 2
+
+    regions = []
+    for row in rows:
+        for left, top, right, bottom, card_shaped in sorted(row):
+            region = refine_card_edges(
+                image,
+                CardGeometry(
+                    top=round(top * scale_y),
+                    right=round(right * scale_x),
+                    bottom=round(bottom * scale_y),
+                    left=round(left * scale_x),
+                ),
+                background,
+                contrast,
+                band,
+            )
+            regions.append((region, card_shaped))
+
+    return regions
+
+
+def refine_card_edges(image, box, background, contrast, band, samples=5):
+    # The box was found on a downscaled copy, so its edges are only known
+    # to a few pixels. Look for the background to card transition on the
+    # full image, in a band around each edge, along a few scan lines.
+    def differs(x, y):
+        r, g, b, _ = QColor(image.pixel(x, y)).getRgbF()
+        return abs((r + g + b) / 3 - background) > contrast
+
+    def find_edge(points):
+        # First of two consecutive card pixels, scanning from the outside,
+        # so a speck of noise on the background is not taken for the edge
+        for i in range(len(points) - 1):
+            if differs(*points[i]) and differs(*points[i + 1]):
+                return i
+        return None
+
+    def refine(edge, outward, lines, point):
+        inward = range(edge + outward * band, edge - outward * (band + 1), -outward)
+        found = []
+        for line in lines:
+            points = [point(p, line) for p in inward]
+            points = [
+                (x, y)
+                for x, y in points
+                if 0 <= x < image.width() and 0 <= y < image.height()
+            ]
+            i = find_edge(points)
+            if i is not None:
+                found.append(points[i])
+        return found
+
+    def scan_lines(low, high):
+        return [
+            round(low + (high - low) * (i + 1) / (samples + 1)) for i in range(samples)
+        ]
+
+    def median(values, default):
+        return sorted(values)[len(values) // 2] if values else default
+
+    rows = scan_lines(box.top, box.bottom)
+    columns = scan_lines(box.left, box.right)
+
+    left = refine(box.left, -1, rows, lambda x, y: (x, y))
+    right = refine(box.right - 1, 1, rows, lambda x, y: (x, y))
+    top = refine(box.top, -1, columns, lambda y, x: (x, y))
+    bottom = refine(box.bottom - 1, 1, columns, lambda y, x: (x, y))
+
+    return CardGeometry(
+        top=median([y for x, y in top], box.top),
+        right=median([x + 1 for x, y in right], box.right),
+        bottom=median([y + 1 for x, y in bottom], box.bottom),
+        left=median([x for x, y in left], box.left),
+    )
+
 
 def word_from_data(data):
     word = ""
@@ -333,6 +778,59 @@ def ascii_card_from_data(data, card_format, word):
     return "\n".join(lines)
 
 
+def write_text(decoded, f):
+    # One 80 column (or whatever the format says) record per card
+    for card, data, word in decoded:
+        f.write(word.ljust(card.format.columns) + "\n")
+
+
+def write_column_binary(decoded, f):
+    # 12 bits per column, two columns every three bytes: 120 bytes for
+    # an 80 column card. The first row always goes in the top bit, rows
+    # past the 12th are not representable.
+    def aligned(bits, rows):
+        if rows < 12:
+            return bits << (12 - rows)
+        return bits >> (rows - 12) & 0xFFF
+
+    for card, data, word in decoded:
+        columns = [aligned(bits, data.rows) for bits in data.columns]
+        record = bytearray()
+        for i in range(0, len(columns), 2):
+            a = columns[i]
+            b = columns[i + 1] if i + 1 < len(columns) else 0
+            record += bytes((a >> 4, (a & 0xF) << 4 | b >> 8, b & 0xFF))
+
+        if len(columns) % 2:
+            del record[-1]
+
+        f.write(record)
+
+
+def write_ascii_cards(decoded, f):
+    for card, data, word in decoded:
+        f.write(ascii_card_from_data(data.holes, card.format, word) + "\n\n")
+
+
+# Name filter, writer and whether the file is binary
+EXPORT_FORMATS = {
+    "Text records (*.txt)": (write_text, False),
+    "Column binary (*.cbn)": (write_column_binary, True),
+    "ASCII cards (*.txt)": (write_ascii_cards, False),
+}
+
+
+def export_deck(deck, path, name_filter):
+    writer, binary = EXPORT_FORMATS[name_filter]
+    if binary:
+        with open(path, "wb") as f:
+            writer(deck.decoded(), f)
+    else:
+        # Unmapped columns are written as "•"
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            writer(deck.decoded(), f)
+
+
 # CARD_WIDTH = 7.0 + 3.0/8.0 # Inches
 # CARD_HEIGHT = 3.25 # Inches
 # CARD_COL_WIDTH = 0.087 # Inches
@@ -394,7 +892,11 @@ class CardsTableModel(QAbstractTableModel):
     def data(self, index, role):
         if role == Qt.DisplayRole:
             if index.column() == 0:
-                return self.deck.cards[index.row()].path.split("/")[-1]
+                card = self.deck.cards[index.row()]
+                name = card.path.split("/")[-1]
+                if card.region is not None:
+                    name += f" @ {card.region.left},{card.region.top}"
+                return name
             elif index.column() == 1:
                 card = self.deck.cards[index.row()]
                 return word_from_data(card.parse_card())
@@ -419,6 +921,8 @@ class MainWindow(QMainWindow):
         self.updating = False
         self.updating_geo_panel = False
         self.geo_paste_buffer = None
+        # Built on demand by the Triage action, decoding the whole deck
+        self.triage_entries = None
 
         self.deck = Deck(cards=[])
         self.deck_model = CardsTableModel(self)
@@ -439,6 +943,12 @@ class MainWindow(QMainWindow):
         )
         self.save_project_action.setShortcut(QKeySequence.Save)
 
+        self.export_action = bar.addAction(
+            self.style().standardIcon(QStyle.SP_DialogSaveButton),
+            "Export",
+            self.on_export,
+        )
+
         bar.addSeparator()
 
         self.open_action = bar.addAction(
@@ -446,6 +956,20 @@ class MainWindow(QMainWindow):
         )
         self.open_action.setShortcut(QKeySequence.Open)
 
+        self.open_sheets_action = bar.addAction(
+            self.style().standardIcon(QStyle.SP_DialogOpenButton),
+            "Open Sheets",
+            self.on_open_sheets,
+        )
+
+        bar.addSeparator()
+
+        self.triage_action = bar.addAction(
+            self.style().standardIcon(QStyle.SP_FileDialogDetailedView),
+            "Triage",
+            self.on_triage,
+        )
+
         bar.addSeparator()
 
         self.font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
@@ -465,6 +989,8 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, self.geometry_panel())
         self.addDockWidget(Qt.BottomDockWidgetArea, self.cards_list_panel())
         self.addDockWidget(Qt.BottomDockWidgetArea, self.ascii_card_panel())
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.threshold_sweep_panel())
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.triage_panel())
 
     def card_edit_scene(self):
         scene = QGraphicsScene()
@@ -499,6 +1025,30 @@ class MainWindow(QMainWindow):
         ascii_card_panel.setWidget(self.text_edit)
         return ascii_card_panel
 
+    def threshold_sweep_panel(self):
+        self.sweep_list = QListWidget()
+        self.sweep_list.setFont(self.font)
+        self.sweep_list.itemActivated.connect(self.on_sweep_activated)
+
+        threshold_sweep_panel = QDockWidget("Threshold Sweep")
+        threshold_sweep_panel.setAllowedAreas(
+            Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea
+        )
+        threshold_sweep_panel.setWidget(self.sweep_list)
+        return threshold_sweep_panel
+
+    def triage_panel(self):
+        self.triage_list = QListWidget()
+        self.triage_list.setFont(self.font)
+        self.triage_list.itemActivated.connect(self.on_triage_activated)
+
+        triage_panel = QDockWidget("Triage")
+        triage_panel.setAllowedAreas(
+            Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea
+        )
+        triage_panel.setWidget(self.triage_list)
+        return triage_panel
+
     def format_panel(self):
         panel_group = QGroupBox()
         panel_group.setFlat(True)
@@ -613,6 +1163,9 @@ class MainWindow(QMainWindow):
         self.deck = deck
         self.deck_model.endResetModel()
 
+        self.triage_entries = None
+        self.redraw_triage()
+
         self.cards_list.resizeColumnsToContents()
 
         self.select_card(0)
@@ -695,15 +1248,22 @@ class MainWindow(QMainWindow):
             self.items_to_delete.append(line_item)
 
         data, word, txt = card.parse(self.format)
+        card_data = card.decode_card()
         colors = {
             False: QColor(0, 0, 0),
             True: QColor(255, 255, 255),
         }
+        low_confidence_color = QColor(255, 0, 0)
 
-        for x, column in zip(card.column_x, data):
-            for y, one in zip(card.row_y, column):
+        for i, (x, column) in enumerate(zip(card.column_x, data)):
+            for j, (y, one) in enumerate(zip(card.row_y, column)):
                 dot = QGraphicsEllipseItem(QRect(-2 + x, -4 + y, 4, 8))
-                dot.setPen(colors[one])
+                margin = card_data.margin(i, j)
+                dot.setPen(
+                    low_confidence_color
+                    if margin is not None and margin < LOW_CONFIDENCE_MARGIN
+                    else colors[one]
+                )
                 dot.setBrush(colors[not one])
 
                 self.scene.addItem(dot)
@@ -711,10 +1271,71 @@ class MainWindow(QMainWindow):
 
         self.text_label.setText(word)
         self.text_edit.setText(txt)
+        self.redraw_threshold_sweep(card)
+        self.update_triage(
+            TriageEntry.from_decoded(self.selected_card_idx, card_data, word)
+        )
 
         index = self.deck_model.index(self.selected_card_idx, 1)
         self.deck_model.dataChanged.emit(index, index, [Qt.DisplayRole])
 
+    def redraw_threshold_sweep(self, card):
+        self.sweep_list.clear()
+
+        for low, high, word in card.threshold_sweep():
+            item = QListWidgetItem(f"{low:.3f} - {high:.3f}  {word}")
+            item.setData(Qt.UserRole, (low + high) / 2)
+            self.sweep_list.addItem(item)
+
+            if low < self.format.threshold <= high:
+                item.setSelected(True)
+
+    def update_triage(self, entry):
+        # Only the edited card changes, the rest of the deck was triaged
+        # by the Triage action
+        if self.triage_entries is None:
+            return
+
+        self.triage_entries = [
+            other for other in self.triage_entries if other.index != entry.index
+        ]
+        self.triage_entries.append(entry)
+        self.triage_entries.sort(key=lambda entry: entry.sort_key)
+        self.redraw_triage()
+
+    def redraw_triage(self):
+        self.triage_list.clear()
+
+        for entry in self.triage_entries or []:
+            card = self.deck.cards[entry.index]
+            flag = "!" if entry.needs_review else " "
+            text = (
+                f"{flag} {entry.index:4d} {card.path.split('/')[-1]}"
+                f"  worst col {entry.worst_column} ({entry.worst_margin:.3f})"
+            )
+            if entry.unmapped_columns:
+                text += f"  unmapped {entry.unmapped_columns}"
+            if entry.outside_columns:
+                text += f"  off image {entry.outside_columns}"
+
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, entry.index)
+            self.triage_list.addItem(item)
+
+    def on_triage(self):
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.triage_entries = self.deck.triage()
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.redraw_triage()
+
+    def on_triage_activated(self, item):
+        self.cards_list.selectRow(item.data(Qt.UserRole))
+
+    def on_sweep_activated(self, item):
+        self.threshold_edit.setValue(item.data(Qt.UserRole))
+
     def on_ui_change(self):
         idx = self.selected_card_idx
         if idx is None:
@@ -739,6 +1360,15 @@ class MainWindow(QMainWindow):
             deck = Deck.from_paths(dialog.selectedFiles())
             self.load_deck(deck)
 
+    def on_open_sheets(self):
+        dialog = QFileDialog(self, "Load Sheets")
+        dialog.setFileMode(QFileDialog.ExistingFiles)
+        dialog.setAcceptMode(QFileDialog.AcceptOpen)
+
+        if dialog.exec() == QFileDialog.Accepted and dialog.selectedFiles():
+            deck = Deck.from_sheets(dialog.selectedFiles())
+            self.load_deck(deck)
+
     def on_open_deck(self):
         dialog = QFileDialog(self, "Load Deck")
         dialog.setFileMode(QFileDialog.ExistingFile)
@@ -759,6 +1389,18 @@ class MainWindow(QMainWindow):
                 with open(dialog.selectedFiles()[0], "w") as f:
                     json.dump(self.deck.to_json(), f)
 
+    def on_export(self):
+        dialog = QFileDialog(self, "Export Deck")
+        dialog.setFileMode(QFileDialog.AnyFile)
+        dialog.setAcceptMode(QFileDialog.AcceptSave)
+        dialog.setNameFilters(list(EXPORT_FORMATS))
+
+        if dialog.exec() == QFileDialog.Accepted:
+            if dialog.selectedFiles():
+                export_deck(
+                    self.deck, dialog.selectedFiles()[0], dialog.selectedNameFilter()
+                )
+
     def on_geo_copy_button(self):
         self.geo_paste_buffer = deepcopy(self.geometry)
         self.paste_button.setEnabled(True)
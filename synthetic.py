@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+# Render punched card images from text, to have decks with a known
+# content to measure the decoder against.
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+
+import random
+import sys
+
+from card import CardGeometry, test_format, translate
+
+# Character to column punches, the inverse of the keypunch table
+encode = {char: key for key, char in translate.items()}
+
+# Printable characters the keypunch table knows about
+CHARSET = "".join(sorted(encode))
+
+# CARD_HOLE_WIDTH and CARD_HOLE_HEIGHT, inches
+HOLE_WIDTH = 0.055
+HOLE_HEIGHT = 0.125
+
+
+def random_text(rng, columns=test_format.columns):
+    return "".join(rng.choice(CHARSET) for _ in range(columns))
+
+
+def render_card(
+    text,
+    card_format=test_format,
+    dpi=100,
+    margin=0.25,
+    noise=0.0,
+    blur=0,
+    skew=0.0,
+    lighting=0.0,
+    seed=None,
+):
+    # Returns the image and the geometry of the card in it. Holes show
+    # the dark surface the card lies on.
+    #   noise: fraction of pixels turned into random speckles
+    #   blur: radius in pixels, approximated by down and up scaling
+    #   skew: rotation of the card in degrees
+    #   lighting: how much darker the right edge is than the left one
+    rng = random.Random(seed)
+
+    card_width = card_format.reference_width * dpi
+    card_height = card_format.reference_height * dpi
+    left = top = margin * dpi
+
+    image = QImage(
+        round(card_width + 2 * left),
+        round(card_height + 2 * top),
+        QImage.Format_RGB32,
+    )
+    image.fill(QColor(25, 25, 25))
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    center = QPointF(left + card_width / 2, top + card_height / 2)
+    painter.translate(center)
+    painter.rotate(skew)
+    painter.translate(-center)
+
+    painter.fillRect(QRectF(left, top, card_width, card_height), QColor(235, 225, 195))
+
+    hole_color = QColor(25, 25, 25)
+    hole_width = HOLE_WIDTH * dpi
+    hole_height = HOLE_HEIGHT * dpi
+
+    for x, char in enumerate(text[: card_format.columns]):
+        punches = encode.get(char, encode[" "])
+        cx = left + (card_format.left_margin + x * card_format.columns_spacing) * dpi
+
+        for y, punch in enumerate(punches[: card_format.rows]):
+            if punch != "O":
+                continue
+
+            cy = top + (card_format.top_margin + y * card_format.rows_spacing) * dpi
+            painter.fillRect(
+                QRectF(
+                    cx - hole_width / 2,
+                    cy - hole_height / 2,
+                    hole_width,
+                    hole_height,
+                ),
+                hole_color,
+            )
+
+    painter.resetTransform()
+
+    if lighting:
+        gradient = QLinearGradient(0, 0, image.width(), 0)
+        gradient.setColorAt(0, QColor(255, 255, 255))
+        shade = round(255 * (1 - lighting))
+        gradient.setColorAt(1, QColor(shade, shade, shade))
+        painter.setCompositionMode(QPainter.CompositionMode_Multiply)
+        painter.fillRect(image.rect(), gradient)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+    if noise:
+        for _ in range(round(noise * image.width() * image.height())):
+            level = rng.randrange(256)
+            painter.fillRect(
+                rng.randrange(image.width()),
+                rng.randrange(image.height()),
+                1,
+                1,
+                QColor(level, level, level),
+            )
+
+    painter.end()
+
+    if blur:
+        small = image.scaled(
+            max(1, image.width() // (blur + 1)),
+            max(1, image.height() // (blur + 1)),
+            Qt.IgnoreAspectRatio,
+            Qt.SmoothTransformation,
+        )
+        image = small.scaled(
+            image.width(), image.height(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation
+        )
+
+    geometry = CardGeometry(
+        top=round(top),
+        right=round(left + card_width),
+        bottom=round(top + card_height),
+        left=round(left),
+    )
+    return image, geometry
+
+
+if __name__ == "__main__":
+    app = QGuiApplication(sys.argv)
+
+    if len(sys.argv) < 3:
+        print(f"usage: {sys.argv[0]} TEXT OUTPUT", file=sys.stderr)
+        sys.exit(1)
+
+    image, geometry = render_card(sys.argv[1].upper())
+    image.save(sys.argv[2])
+    print(geometry)
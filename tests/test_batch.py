@@ -0,0 +1,189 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication
+
+from copy import deepcopy
+
+import random
+
+import pytest
+
+import batch
+from card import Card, Deck, test_format
+from synthetic import random_text, render_card
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+class Preempted(BaseException):
+    # Not an Exception, so run_batch does not log it as a card error
+    pass
+
+
+@pytest.fixture
+def deck(tmp_path):
+    # Ten cards cycling through four scans
+    rng = random.Random(0)
+    scans = []
+    for i in range(4):
+        image, geometry = render_card(random_text(rng), dpi=40)
+        path = str(tmp_path / f"card{i}.png")
+        image.save(path)
+        scans.append((path, geometry))
+
+    cards = []
+    for i in range(10):
+        path, geometry = scans[i % len(scans)]
+        cards.append(
+            Card(geometry=deepcopy(geometry), format=deepcopy(test_format), path=path)
+        )
+    return Deck(cards=cards)
+
+
+def indices(log_path):
+    return [record["index"] for record in batch.read_log(log_path)]
+
+
+def test_resume_after_crash(deck, tmp_path, monkeypatch):
+    log = str(tmp_path / "deck.jsonl")
+    decode_card = Card.decode_card
+    calls = []
+
+    def crashing(card):
+        calls.append(card)
+        if len(calls) == 8:
+            raise Preempted()
+        return decode_card(card)
+
+    monkeypatch.setattr(Card, "decode_card", crashing)
+    with pytest.raises(Preempted):
+        batch.run_batch(deck, log, every=3)
+
+    checkpoint = batch.read_checkpoint(log)
+    assert checkpoint["next"] == 6
+    assert not checkpoint["done"]
+
+    monkeypatch.setattr(Card, "decode_card", decode_card)
+    checkpoint = batch.run_batch(deck, log, every=3)
+
+    assert checkpoint["done"]
+    assert indices(log) == list(range(10))
+
+
+def test_unreadable_card_is_logged(deck, tmp_path):
+    deck.cards[4].path = str(tmp_path / "missing.png")
+    log = str(tmp_path / "deck.jsonl")
+
+    batch.run_batch(deck, log, every=3)
+
+    records = list(batch.read_log(log))
+    assert [record["index"] for record in records] == list(range(10))
+    assert "error" in records[4]
+    assert all("word" in record for i, record in enumerate(records) if i != 4)
+
+
+def test_missing_log_raises(deck, tmp_path):
+    log = str(tmp_path / "deck.jsonl")
+    batch.write_checkpoint(
+        log,
+        {
+            "deck": batch.deck_fingerprint(deck),
+            "start": 0,
+            "stop": 10,
+            "next": 3,
+            "offset": 100,
+            "done": False,
+        },
+    )
+
+    with pytest.raises(Exception, match="shorter than its checkpoint"):
+        batch.run_batch(deck, log)
+
+
+def test_resume_rejects_a_different_deck(deck, tmp_path, monkeypatch):
+    log = str(tmp_path / "deck.jsonl")
+    decode_card = Card.decode_card
+    calls = []
+
+    def crashing(card):
+        calls.append(card)
+        if len(calls) == 5:
+            raise Preempted()
+        return decode_card(card)
+
+    monkeypatch.setattr(Card, "decode_card", crashing)
+    with pytest.raises(Preempted):
+        batch.run_batch(deck, log, every=2)
+    monkeypatch.setattr(Card, "decode_card", decode_card)
+
+    # The deck was re-saved with a corrected geometry
+    deck.cards[7].geometry.left += 1
+
+    with pytest.raises(Exception, match="different deck"):
+        batch.run_batch(deck, log, every=2)
+
+
+@pytest.mark.parametrize("start, stop", [(-2, None), (4, 2), (11, None)])
+def test_invalid_ranges_are_rejected(deck, tmp_path, start, stop):
+    with pytest.raises(Exception, match="invalid card range"):
+        batch.run_batch(deck, str(tmp_path / "deck.jsonl"), start=start, stop=stop)
+
+
+def test_every_must_be_positive(deck, tmp_path):
+    with pytest.raises(Exception):
+        batch.run_batch(deck, str(tmp_path / "deck.jsonl"), every=0)
+
+
+def test_merge_in_card_order(deck, tmp_path):
+    full = str(tmp_path / "full.jsonl")
+    batch.run_batch(deck, full)
+
+    shards = [str(tmp_path / f"shard{i}.jsonl") for i in range(3)]
+    batch.run_batch(deck, shards[2], start=7)
+    batch.run_batch(deck, shards[0], stop=3)
+    batch.run_batch(deck, shards[1], start=3, stop=7)
+
+    merged = str(tmp_path / "merged.jsonl")
+    batch.merge_logs(list(reversed(shards)), merged, cards=10)
+
+    assert indices(merged) == list(range(10))
+    assert list(batch.read_log(merged)) == list(batch.read_log(full))
+
+
+def test_merge_rejects_gaps_and_overlaps(deck, tmp_path):
+    first = str(tmp_path / "first.jsonl")
+    last = str(tmp_path / "last.jsonl")
+    overlapping = str(tmp_path / "overlapping.jsonl")
+    batch.run_batch(deck, first, stop=4)
+    batch.run_batch(deck, last, start=6)
+    batch.run_batch(deck, overlapping, start=2, stop=6)
+
+    merged = str(tmp_path / "merged.jsonl")
+    with pytest.raises(Exception, match="no shard"):
+        batch.merge_logs([first, last], merged)
+
+    with pytest.raises(Exception, match="overlaps"):
+        batch.merge_logs([first, overlapping, last], merged)
+
+    with pytest.raises(Exception, match="no shard"):
+        batch.merge_logs([first], merged, cards=10)
+
+    with pytest.raises(Exception, match="no shard"):
+        batch.merge_logs([last], merged)
+
+    # Shards must reach the end of the deck even without --cards
+    with pytest.raises(Exception, match="no shard"):
+        batch.merge_logs([first], merged)
+
+
+def test_merge_rejects_shards_of_different_decks(deck, tmp_path):
+    first = str(tmp_path / "first.jsonl")
+    last = str(tmp_path / "last.jsonl")
+    batch.run_batch(deck, first, stop=5)
+    deck.cards[7].geometry.left += 1
+    batch.run_batch(deck, last, start=5)
+
+    with pytest.raises(Exception, match="different deck"):
+        batch.merge_logs([first, last], str(tmp_path / "merged.jsonl"))
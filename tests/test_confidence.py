@@ -0,0 +1,105 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication
+
+from array import array
+from copy import deepcopy
+
+import random
+
+import pytest
+
+from card import (
+    OUTSIDE_MARGIN,
+    Card,
+    CardData,
+    CardGeometry,
+    Deck,
+    TriageEntry,
+    test_format,
+    word_from_data,
+)
+from synthetic import encode, random_text, render_card
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+@pytest.fixture
+def scan(tmp_path):
+    text = random_text(random.Random(0))
+    image, geometry = render_card(text, dpi=60)
+    path = str(tmp_path / "card.png")
+    image.save(path)
+    return path, geometry, text
+
+
+def make_card(scan, geometry=None):
+    path, scan_geometry, text = scan
+    return Card(
+        geometry=deepcopy(geometry or scan_geometry),
+        format=deepcopy(test_format),
+        path=path,
+    )
+
+
+def test_columns_are_packed_first_row_first():
+    data = CardData(columns=array("L", [0b100000000001, 0]), margins=b"", rows=12)
+
+    assert data.holes[0] == [True] + [False] * 10 + [True]
+    assert data.holes[1] == [False] * 12
+
+
+def test_margins_skip_cells_outside_of_the_image():
+    margins = bytes([254, 10, OUTSIDE_MARGIN, 127, OUTSIDE_MARGIN, OUTSIDE_MARGIN])
+    data = CardData(columns=array("L", [0, 0]), margins=margins, rows=3)
+
+    assert data.margin(0, 1) == 10 / 254
+    assert data.margin(0, 2) is None
+    assert data.column_margin(0) == 10 / 254
+    assert data.column_margin(1) == 127 / 254
+    assert data.worst_column == (0, 10 / 254)
+    assert data.outside_columns == [0, 1]
+
+
+def test_decoded_card_matches_punched_text(scan):
+    card = make_card(scan)
+    text = scan[2]
+
+    data = card.decode_card()
+
+    assert data.holes == card.parse_card()
+    assert word_from_data(data.holes) == text
+    for bits, char in zip(data.columns, text):
+        key = "".join("O" if bits >> (11 - y) & 1 else " " for y in range(12))
+        assert key == "".join(encode[char])
+    assert data.outside_columns == []
+    assert OUTSIDE_MARGIN not in data.margins
+
+
+def test_grid_off_the_image_needs_review(scan):
+    card = make_card(
+        scan, CardGeometry(top=10000, right=20000, bottom=12000, left=10000)
+    )
+
+    entry = TriageEntry.from_decoded(0, card.decode_card(), "")
+
+    assert entry.outside_columns == list(range(test_format.columns))
+    assert entry.needs_review
+
+
+def test_triage_puts_cards_needing_review_first(scan):
+    clean = make_card(scan)
+    off_image = make_card(
+        scan, CardGeometry(top=10000, right=20000, bottom=12000, left=10000)
+    )
+    ambiguous = make_card(scan)
+    # Just above the gray of the holes
+    ambiguous.format.threshold = 0.11
+
+    entries = Deck(cards=[clean, off_image, ambiguous, make_card(scan)]).triage()
+
+    flagged = [entry.index for entry in entries if entry.needs_review]
+    assert sorted(flagged) == [1, 2]
+    assert [entry.index for entry in entries[:2]] == flagged
@@ -0,0 +1,108 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication
+
+from array import array
+from copy import deepcopy
+
+import io
+import random
+
+import pytest
+
+from card import (
+    Card,
+    CardData,
+    CardGeometry,
+    Deck,
+    export_deck,
+    test_format,
+    write_column_binary,
+)
+from synthetic import random_text, render_card
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def column_binary(columns, rows):
+    data = CardData(columns=array("L", columns), margins=b"", rows=rows)
+    f = io.BytesIO()
+    write_column_binary([(None, data, "")], f)
+    return f.getvalue()
+
+
+def test_two_columns_every_three_bytes():
+    assert column_binary([0x800, 0x001], 12) == bytes([0x80, 0x00, 0x01])
+    assert column_binary([0xABC, 0xDEF], 12) == bytes([0xAB, 0xCD, 0xEF])
+
+
+def test_odd_column_count_ends_on_half_a_byte_pair():
+    assert column_binary([0xABC, 0xDEF, 0x123], 12) == bytes(
+        [0xAB, 0xCD, 0xEF, 0x12, 0x30]
+    )
+
+
+@pytest.mark.parametrize(
+    "rows, bits, expected",
+    [
+        # The first row always lands in the top bit
+        (9, 0b100000001, 0x808),
+        (12, 0b100000000001, 0x801),
+        # Rows past the 12th are dropped
+        (14, 0b10000000000111, 0x801),
+    ],
+)
+def test_rows_are_left_aligned(rows, bits, expected):
+    record = column_binary([bits, 0], rows)
+    assert record[0] << 4 | record[1] >> 4 == expected
+
+
+@pytest.fixture
+def deck(tmp_path):
+    rng = random.Random(0)
+    cards = []
+    texts = []
+    for i in range(3):
+        text = random_text(rng)
+        image, geometry = render_card(text, dpi=60)
+        path = str(tmp_path / f"card{i}.png")
+        image.save(path)
+        cards.append(Card(geometry=geometry, format=deepcopy(test_format), path=path))
+        texts.append(text)
+
+    # A card whose grid misses the holes, decoding to unmapped columns
+    cards.append(
+        Card(
+            geometry=CardGeometry(top=0, right=1, bottom=1, left=0),
+            format=deepcopy(test_format),
+            path=cards[0].path,
+        )
+    )
+    return Deck(cards=cards), texts
+
+
+def test_column_binary_export_is_120_bytes_per_card(deck, tmp_path):
+    deck, texts = deck
+    path = str(tmp_path / "deck.cbn")
+
+    export_deck(deck, path, "Column binary (*.cbn)")
+
+    with open(path, "rb") as f:
+        assert len(f.read()) == 120 * len(deck.cards)
+
+
+def test_text_export_is_utf8_records(deck, tmp_path):
+    deck, texts = deck
+    path = str(tmp_path / "deck.txt")
+
+    export_deck(deck, path, "Text records (*.txt)")
+
+    with open(path, "rb") as f:
+        lines = f.read().decode("utf-8").split("\n")
+
+    assert lines[:3] == texts
+    assert "•" in lines[3]
+    assert all(len(line) == 80 for line in lines[:4])
+    assert lines[4:] == [""]
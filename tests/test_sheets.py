@@ -0,0 +1,81 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QColor, QGuiApplication, QImage, QPainter
+
+import random
+
+from card import CardGeometry, Deck, detect_card_regions
+from synthetic import random_text, render_card
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+BACKGROUND = QColor(25, 25, 25)
+CARD = QColor(235, 225, 195)
+
+
+def make_sheet(width, height):
+    sheet = QImage(width, height, QImage.Format_RGB32)
+    sheet.fill(BACKGROUND)
+    return sheet
+
+
+def test_cards_are_found_with_exact_edges(tmp_path):
+    rng = random.Random(0)
+    sheet = make_sheet(1700, 1250)
+    painter = QPainter(sheet)
+
+    texts = []
+    expected = []
+    for top in (50, 450, 850):
+        for left in (50, 900):
+            text = random_text(rng)
+            image, geometry = render_card(text, margin=0)
+            painter.drawImage(left, top, image)
+            texts.append(text)
+            expected.append(
+                CardGeometry(
+                    top=top,
+                    right=left + geometry.right,
+                    bottom=top + geometry.bottom,
+                    left=left,
+                )
+            )
+
+    painter.end()
+    path = str(tmp_path / "sheet.png")
+    sheet.save(path)
+
+    deck = Deck.from_sheets([path])
+
+    assert [card.region for card in deck.cards] == expected
+    assert [card.parse(card.format)[1] for card in deck.cards] == texts
+
+
+def test_blobs_not_shaped_like_cards_keep_reading_order(tmp_path):
+    sheet = make_sheet(1600, 800)
+    painter = QPainter(sheet)
+    painter.fillRect(QRect(50, 50, 500, 220), CARD)
+    # Two cards touching each other make one blob too wide for a card
+    painter.fillRect(QRect(600, 50, 500, 220), CARD)
+    painter.fillRect(QRect(1100, 50, 450, 220), CARD)
+    painter.fillRect(QRect(50, 400, 500, 220), CARD)
+    painter.end()
+    path = str(tmp_path / "sheet.png")
+    sheet.save(path)
+
+    regions = detect_card_regions(sheet)
+    deck = Deck.from_sheets([path])
+
+    assert [card_shaped for region, card_shaped in regions] == [True, False, True]
+    assert [card.region for card in deck.cards] == [r for r, _ in regions]
+    assert deck.cards[1].region.left == 600
+    assert deck.cards[1].region.right == 1550
+    assert deck.cards[1].geometry == CardGeometry(top=0, right=0, bottom=0, left=0)
+    assert deck.cards[2].geometry == deck.cards[2].region
+
+
+def test_empty_image_has_no_regions():
+    assert detect_card_regions(QImage()) == []
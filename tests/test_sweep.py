@@ -0,0 +1,59 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QColor, QGuiApplication, QImage
+
+from copy import deepcopy
+
+import random
+
+import pytest
+
+from card import Card, CardGeometry, test_format, word_from_data
+from synthetic import random_text, render_card
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def make_card(tmp_path, image, geometry):
+    path = str(tmp_path / "card.png")
+    image.save(path)
+    return Card(geometry=geometry, format=deepcopy(test_format), path=path)
+
+
+def test_sweep_covers_the_threshold_range(tmp_path):
+    text = random_text(random.Random(0))
+    card = make_card(tmp_path, *render_card(text, noise=0.01, blur=1, seed=0))
+
+    sweep = card.threshold_sweep()
+
+    assert sweep[0][0] == 0.0
+    assert sweep[-1][1] == 1.0
+    for (_, high, _), (low, _, _) in zip(sweep, sweep[1:]):
+        assert high == low
+
+    for low, high, word in sweep:
+        assert low < high
+        card.format.threshold = (low + high) / 2
+        assert word_from_data(card.parse_card()) == word
+
+    card.format.threshold = test_format.threshold
+    assert [
+        word for low, high, word in sweep if low < test_format.threshold <= high
+    ] == [text]
+
+
+@pytest.mark.parametrize("level", [0, 255])
+def test_sweep_has_no_empty_intervals(tmp_path, level):
+    # Pure black and pure white cells sit on the ends of the range
+    image = QImage(200, 100, QImage.Format_RGB32)
+    image.fill(QColor(level, level, level))
+    card = make_card(
+        tmp_path, image, CardGeometry(top=0, right=200, bottom=100, left=0)
+    )
+
+    sweep = card.threshold_sweep()
+
+    assert sweep
+    assert all(low < high for low, high, word in sweep)